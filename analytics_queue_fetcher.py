@@ -5,26 +5,42 @@ Set ANALYTICS_API_KEY (Bearer token), optionally ANALYTICS_BASE_URL and ANALYTIC
 Loads .env from this folder.
 """
 import os
-import json
+import random
+import re
 import time
 import gzip
+import shutil
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 # Load .env from project folder
 _root = Path(__file__).resolve().parent
 _env_file = _root / ".env"
-if _env_file.exists():
-    for line in _env_file.read_text(encoding="utf-8", errors="ignore").splitlines():
-        line = line.strip()
-        if line and not line.startswith("#") and "=" in line:
-            key, _, value = line.partition("=")
-            key, value = key.strip(), value.strip().strip('"').strip("'")
-            if key and value and key not in os.environ:
-                os.environ[key] = value
+# KEY=value lines (fallback parser when python-dotenv is not installed); comments and blank lines never match
+_ENV_LINE_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*?)[ \t]*=(.*)$", re.MULTILINE)
+
+
+def _load_env_file():
+    """Copy .env settings into os.environ. Variables already set win and empty values are skipped."""
+    if not _env_file.exists():
+        return
+    try:
+        from dotenv import dotenv_values
+        values = dotenv_values(_env_file)
+    except ImportError:
+        text = _env_file.read_text(encoding="utf-8", errors="ignore")
+        values = {key: value.strip().strip('"').strip("'") for key, value in _ENV_LINE_RE.findall(text)}
+    for key, value in values.items():
+        if key and value and key not in os.environ:
+            os.environ[key] = value
+
+
+_load_env_file()
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     requests = None
 
@@ -85,6 +101,24 @@ def _headers():
     }
 
 
+_session = None
+
+
+def _get_session():
+    """Shared keep-alive session for submit/poll/download, so polls reuse one TCP+TLS connection.
+    Auth headers are passed per call (see _headers) so a rotated token is used without a restart;
+    idempotent GETs retry on 502/503/504."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+
 def _date_range_for_day(date_utc):
     """Return (start_date, end_date) strings for that day in UTC (ISO format for API)."""
     start = date_utc.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -125,13 +159,15 @@ def submit_queue(start_date_str=None, end_date_str=None, for_date_utc=None):
         start_date, end_date = _date_range_for_day(for_date_utc)
     else:
         raise ValueError("Pass (start_date_str, end_date_str) or for_date_utc")
-    payload = json.loads(json.dumps(QUEUE_PAYLOAD_TEMPLATE))
-    payload["query"]["startDate"] = start_date
-    payload["query"]["endDate"] = end_date
-    payload["name"] = _report_name_from_dates(start_date, end_date)
-    payload["timestamp"] = int(time.time() * 1000)
+    # Overlay only the per-request fields; the template itself is never mutated, so no deep copy is needed
+    payload = {
+        **QUEUE_PAYLOAD_TEMPLATE,
+        "query": {**QUEUE_PAYLOAD_TEMPLATE["query"], "startDate": start_date, "endDate": end_date},
+        "name": _report_name_from_dates(start_date, end_date),
+        "timestamp": int(time.time() * 1000),
+    }
     url = f"{BASE_URL}/submitQueueRequest"
-    r = requests.post(url, headers=_headers(), json=payload, timeout=60)
+    r = _get_session().post(url, json=payload, headers=_headers(), timeout=60)
     if not r.ok:
         try:
             data = r.json()
@@ -188,18 +224,30 @@ def _status_summary(data):
     return status, progress, data_size, message
 
 
+def _next_poll_delay(progress, previous_delay, poll_interval):
+    """Seconds until the next status poll, between 2 s and poll_interval.
+    With a percentage, wait less as the job nears 100% ((100 - pct) * 0.3 s); without one, back off exponentially from 5 s."""
+    try:
+        delay = (100 - float(progress)) * 0.3
+    except (TypeError, ValueError):
+        delay = 5 if previous_delay is None else previous_delay * 2
+    return max(2, min(poll_interval, delay))
+
+
 def poll_until_succeeded(queue_id, max_wait_seconds=1200, poll_interval=30):
-    """Step 2: Poll getAllQueueStatus until status indicates success. Prints queue ID, then status/progress every poll."""
+    """Step 2: Poll getAllQueueStatus until status indicates success. Prints queue ID, then status/progress every poll.
+    Polls adaptively (see _next_poll_delay), at most poll_interval seconds apart."""
     if not requests:
         raise RuntimeError("Install requests: pip install requests")
     url = f"{BASE_URL}/getAllQueueStatus"
     params = {"queueId": queue_id}
     deadline = time.time() + max_wait_seconds
     attempt = 0
+    delay = None
     start = time.time()
     while time.time() < deadline:
         attempt += 1
-        r = requests.get(url, headers=_headers(), params=params, timeout=30)
+        r = _get_session().get(url, params=params, headers=_headers(), timeout=30)
         r.raise_for_status()
         data = r.json()
         status, progress, data_size, message = _status_summary(data)
@@ -222,22 +270,32 @@ def poll_until_succeeded(queue_id, max_wait_seconds=1200, poll_interval=30):
         if success:
             print("  Step 2 complete: status = Success.")
             return queue_id
-        time.sleep(poll_interval)
+        delay = _next_poll_delay(progress, delay, poll_interval)
+        # +/-10% jitter so concurrent pollers don't hit the API in lockstep, clamped to poll_interval after the jitter;
+        # never sleep past the deadline
+        time.sleep(max(0, min(delay * random.uniform(0.9, 1.1), poll_interval, deadline - time.time())))
     raise TimeoutError(f"Queue {queue_id} did not succeed within {max_wait_seconds}s")
 
 
 def download_queue_file(query_id, output_path):
-    """Step 3: GET queueDownload and save to output_path. Handles gzip if needed."""
+    """Step 3: GET queueDownload and stream it to output_path (via a .part file, so a failed download never
+    leaves a truncated CSV). Handles gzip if needed."""
     if not requests:
         raise RuntimeError("Install requests: pip install requests")
     url = f"{BASE_URL}/queueDownload"
     params = {"queryId": query_id}
-    r = requests.get(url, headers=_headers(), params=params, timeout=120)
-    r.raise_for_status()
-    content = r.content
-    if r.headers.get("Content-Encoding") == "gzip":
-        content = gzip.decompress(content)
-    Path(output_path).write_bytes(content)
+    part_path = Path(str(output_path) + ".part")
+    try:
+        with _get_session().get(url, params=params, headers=_headers(), timeout=120, stream=True) as r:
+            r.raise_for_status()
+            r.raw.decode_content = True  # same bytes r.content would give, read incrementally
+            src = gzip.GzipFile(fileobj=r.raw) if r.headers.get("Content-Encoding") == "gzip" else r.raw
+            with open(part_path, "wb") as f:
+                shutil.copyfileobj(src, f, length=1 << 20)
+        os.replace(part_path, output_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
     return output_path
 
 
@@ -264,7 +322,7 @@ def fetch_and_save(output_path="domain_data.csv", for_date_utc=None, last_n_days
     print(">>> Queue ID: {}".format(queue_id))
     print("    (You can verify this ID on your analytics system.)")
     print("")
-    print("=== Step 2: Polling status (every 30 s, up to 20 min) ===")
+    print("=== Step 2: Polling status (adaptive, at most 30 s apart, up to 20 min) ===")
     poll_until_succeeded(queue_id, max_wait_seconds=1200, poll_interval=30)
     print("")
     print("=== Step 3: Downloading file ===")
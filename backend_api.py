@@ -1,66 +1,143 @@
 from flask import Flask, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 import pandas as pd
+import numpy as np
+import orjson
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
+import hashlib
 import os
 import logging
-from pathlib import Path
+import multiprocessing
+import threading
+import time
+
+# Data file paths and the loader live in data_loader, which the scheduled fetch also runs in a spawned child
+from data_loader import DATA_CSV_PATH, fetch_and_prepare, load_data
 
 logger = logging.getLogger(__name__)
 
-# Data file: use env if set, else resolve relative to this script so it's always in project folder
-_default_csv = Path(__file__).resolve().parent / "domain_data.csv"
-DATA_CSV_PATH = os.environ.get("DATA_CSV_PATH") or str(_default_csv)
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson: jsonify() and request.json encode/decode in C, NumPy values included."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for React frontend
-
-# Load data with optimized dtypes for faster load and lower memory
-# Expects: Day (format 2026-02-14), Advertiser, Campaign, Domain, Ad Impressions, Clicks, Weighted Conversion
-def load_data():
-    """Load and preprocess the data from DATA_CSV_PATH. Returns empty DataFrame if file missing (e.g. localhost before first Gmail fetch)."""
-    if not os.path.isfile(DATA_CSV_PATH):
-        logger.warning("Data file not found: %s. Use Gmail fetcher or add file, then reload.", DATA_CSV_PATH)
-        return pd.DataFrame(columns=[
-            "Day", "Advertiser", "Campaign", "Domain", "Ad Impressions", "Clicks", "Weighted Conversion",
-            "Date", "Impressions", "Conversions", "Clean Domain", "Clean Keyword"
-        ]).astype({"Date": "datetime64[ns]", "Clicks": "int64", "Impressions": "int64"})
-    df = pd.read_csv(
-        DATA_CSV_PATH,
-        dtype={'Clicks': 'int64', 'Ad Impressions': 'int64'},
-    )
-    df.columns = df.columns.str.strip()
-    # Normalize column names: some CSVs use "Domain (Old)" instead of "Domain"
-    if 'Domain' not in df.columns and 'Domain (Old)' in df.columns:
-        df['Domain'] = df['Domain (Old)'].astype(str)
-    elif 'Domain' not in df.columns:
-        raise ValueError("CSV must have a 'Domain' or 'Domain (Old)' column")
-    # Day column: accept 2026-02-14, 2026/02/14, or ISO with time (strip whitespace)
-    date_col_name = 'Day' if 'Day' in df.columns else 'Date'
-    day_col = df[date_col_name].astype(str).str.strip()
-    df['Date'] = pd.to_datetime(day_col, format='%Y-%m-%d', errors='coerce')
-    # If strict format parsed nothing, try inferring (e.g. 2026/02/14 or ISO datetime)
-    if df['Date'].isna().all():
-        df['Date'] = pd.to_datetime(day_col, errors='coerce')
-    df = df.dropna(subset=['Date'])
-    df['Impressions'] = df['Ad Impressions'].astype('int64')
-    df['Conversions'] = df['Weighted Conversion'].fillna(0).astype('float64')  # sum as float, display as int
-    df['Clean Domain'] = df['Domain'].str.replace(r'^www\.', '', regex=True, case=False)
-    df['Clean Keyword'] = ''  # no keyword column in this file; analysis is domain-only
-    return df
+app.json = OrjsonProvider(app)
+CORS(app, expose_headers=['ETag', 'X-Cache'])  # Enable CORS for React frontend (and let it read cache headers)
+
+
+def build_filter_lookups(data_df):
+    """Precompute the filter-endpoint lookups: sorted advertisers, advertiser -> sorted campaigns, all campaigns,
+    campaign -> advertiser (the advertiser on the campaign's first row in Date order, the frame's order).
+    Rows with a blank Advertiser or Campaign (NaN) are left out, so sorted() only ever compares strings."""
+    pairs = data_df[['Advertiser', 'Campaign']].dropna().drop_duplicates()
+    first_advertiser = pairs.drop_duplicates('Campaign')
+    return {
+        'advertisers': sorted(pairs['Advertiser'].unique().tolist()),
+        'advertiser_campaigns': {
+            advertiser: sorted(group['Campaign'].tolist())
+            for advertiser, group in pairs.groupby('Advertiser', observed=True, sort=False)
+        },
+        'all_campaigns': sorted(pairs['Campaign'].unique().tolist()),
+        'campaign_advertiser': dict(zip(first_advertiser['Campaign'], first_advertiser['Advertiser'])),
+    }
+
+# multiprocessing's spawn re-imports the script run as `python backend_api.py` under this name in the fetch child,
+# which only needs data_loader: no data load or scheduler there
+_SPAWNED_CHILD = __name__ == '__mp_main__'
 
 # Global dataframe; reload_data() updates this after Gmail fetch
-df = load_data()
+if _SPAWNED_CHILD:
+    df = filter_lookups = None
+else:
+    df = load_data()
+    filter_lookups = build_filter_lookups(df)
+# Bumped on every reload; part of the dashboard cache key so responses never outlive their data
+_df_version = 0
+# Serializes reloads (scheduler, /api/reload, /api/fetch) so two never parse and write the cache at once
+_reload_lock = threading.Lock()
+
+# Serialized /api/dashboard-data responses: key -> (expires_at, body). LRU-bounded, TTL-expired, cleared on reload.
+DASHBOARD_CACHE_TTL_SECONDS = 300
+DASHBOARD_CACHE_MAX_ENTRIES = 256
+_dashboard_cache = OrderedDict()
+_dashboard_cache_lock = threading.Lock()
+
+
+def _dashboard_cache_get(key):
+    """Return the cached response body for key, or None if missing/expired."""
+    with _dashboard_cache_lock:
+        entry = _dashboard_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _dashboard_cache[key]
+            return None
+        _dashboard_cache.move_to_end(key)
+        return entry[1]
+
+
+def _dashboard_cache_put(key, body):
+    """Store a response body, evicting the least recently used entries past the size limit."""
+    with _dashboard_cache_lock:
+        _dashboard_cache[key] = (time.monotonic() + DASHBOARD_CACHE_TTL_SECONDS, body)
+        _dashboard_cache.move_to_end(key)
+        while len(_dashboard_cache) > DASHBOARD_CACHE_MAX_ENTRIES:
+            _dashboard_cache.popitem(last=False)
+
+
+# Filtered per-scope aggregates (see _scope_aggregates), shared across topN/metric changes. LRU-bounded, cleared on reload.
+SCOPE_CACHE_MAX_ENTRIES = 32
+_scope_cache = OrderedDict()
+_scope_cache_lock = threading.Lock()
+
+
+# Set by gunicorn.conf.py under preload_app: forwards reloads to the master, which reloads and re-forks the workers
+reload_forwarder = None
+# Finished reloads and the last one's error (None if it succeeded). Set where the reload ran (the gunicorn master),
+# so re-forked workers report the reload they were forked after; see /api/data-status
+_reload_count = 0
+_reload_error = None
 
 
 def reload_data():
-    """Reload the in-memory dataframe from disk (call after Gmail fetcher updates the CSV)."""
-    global df
+    """Reload the in-memory dataframe from disk (call after Gmail fetcher updates the CSV).
+    Returns True/False for a reload done in this process, None if it was handed to the gunicorn master."""
+    if reload_forwarder is not None:
+        reload_forwarder()
+        return None
+    return reload_local_data()
+
+
+def reload_local_data():
+    """Reload this process's dataframe from disk. The new frame and lookups are built aside and published in one
+    assignment; published frames are never modified, so requests keep whichever frame they bound at the start.
+    Returns False (and keeps the previous frame) if the load fails."""
+    global df, filter_lookups, _df_version, _reload_count, _reload_error
     try:
-        df = load_data()
+        with _reload_lock:
+            new_df = load_data()
+            new_lookups = build_filter_lookups(new_df)
+            df, filter_lookups, _df_version = new_df, new_lookups, _df_version + 1
+        with _dashboard_cache_lock:
+            _dashboard_cache.clear()
+        with _scope_cache_lock:
+            _scope_cache.clear()
         logger.info("Data reloaded from %s", DATA_CSV_PATH)
+        _reload_error = None
     except Exception as e:
         logger.exception("Failed to reload data: %s", e)
+        _reload_error = str(e)
+    _reload_count += 1
+    return _reload_error is None
 
 @app.route('/')
 @app.route('/api/health')
@@ -73,36 +150,64 @@ def health():
 def api_data_status():
     """Return whether data file exists and how many rows are loaded (for debugging)."""
     exists = os.path.isfile(DATA_CSV_PATH)
-    rows = len(df)
+    data_df = df
+    rows = len(data_df)
     date_min = None
     date_max = None
-    if rows and pd.notna(df['Date'].min()) and pd.notna(df['Date'].max()):
-        date_min = df['Date'].min().strftime('%Y-%m-%d')
-        date_max = df['Date'].max().strftime('%Y-%m-%d')
+    first_date, last_date = _date_bounds(data_df)
+    if first_date is not None:
+        date_min = first_date.strftime('%Y-%m-%d')
+        date_max = last_date.strftime('%Y-%m-%d')
     return jsonify({
         'file_path': DATA_CSV_PATH,
         'file_exists': exists,
         'rows_loaded': rows,
         'date_min': date_min,
         'date_max': date_max,
+        'reload_count': _reload_count,
+        'reload_error': _reload_error,
         'hint': 'Call POST /api/reload to load the file into memory if rows_loaded is 0 but file_exists is true.',
     })
 
 
+def _reload_response(done_message, accepted_message):
+    """Reload and report it: 200 with the new row count, 500 if the load failed, or 202 under gunicorn, where the
+    master reloads and re-forks the workers after this reply. Then poll /api/data-status until reload_count
+    exceeds the one returned here and check reload_error."""
+    reload_count = _reload_count
+    reloaded = reload_data()
+    if reloaded is None:
+        return jsonify({'status': 'accepted', 'message': accepted_message, 'reload_count': reload_count}), 202
+    if not reloaded:
+        return jsonify({'status': 'error', 'message': 'Reload failed: ' + _reload_error}), 500
+    return jsonify({'status': 'ok', 'message': done_message, 'rows': len(df)})
+
+
 @app.route('/api/reload', methods=['POST', 'GET'])
 def api_reload():
     """Reload data from disk (e.g. after analytics fetch updates domain_data.csv). No restart needed."""
     try:
-        reload_data()
-        return jsonify({'status': 'ok', 'message': 'Data reloaded from ' + DATA_CSV_PATH, 'rows': len(df)})
+        return _reload_response('Data reloaded from ' + DATA_CSV_PATH,
+                                'Reload of ' + DATA_CSV_PATH + ' requested; live once the workers restart')
     except Exception as e:
         logger.exception("Reload failed: %s", e)
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+def _fetch_target_error():
+    """Why the fetchers must not write DATA_CSV_PATH, or None. They download CSV bytes, which in a .parquet
+    file would fail the reload and every later start."""
+    if DATA_CSV_PATH.lower().endswith('.parquet'):
+        return 'DATA_CSV_PATH is a .parquet file; fetching writes CSV, so update the Parquet export instead'
+    return None
+
+
 @app.route('/api/fetch', methods=['POST', 'GET'])
 def api_fetch():
     """Fetch data: if ANALYTICS_API_KEY set, run queue flow (submit→poll→download) for last N days (default 45); else use ANALYTICS_DATA_URL. Then reload."""
+    target_error = _fetch_target_error()
+    if target_error:
+        return jsonify({'status': 'error', 'message': target_error}), 400
     try:
         if os.environ.get("ANALYTICS_API_KEY") or os.environ.get("ANALYTICS_BEARER_TOKEN"):
             from analytics_queue_fetcher import fetch_and_save
@@ -112,8 +217,8 @@ def api_fetch():
             ok, result = fetch_and_save(output_path=DATA_CSV_PATH)
         if not ok:
             return jsonify({'status': 'error', 'message': result}), 400
-        reload_data()
-        return jsonify({'status': 'ok', 'message': 'Fetched and reloaded: ' + result})
+        return _reload_response('Fetched and reloaded: ' + result,
+                                'Fetched: ' + result + '; reload requested, live once the workers restart')
     except Exception as e:
         logger.exception("Fetch failed: %s", e)
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -124,24 +229,34 @@ def get_week_range(date, week_offset=0):
     week_start = week_end - timedelta(days=6)
     return week_start, week_end
 
-def calculate_metrics(advertiser, campaign, week_start, week_end, metric_type='Conversions', group_col='Clean Domain', data_df=None):
-    """Calculate metrics for a specific week, grouped by group_col. Use data_df if provided (pre-filtered by date range) for speed."""
-    base = data_df if data_df is not None else df
-    week_data = base[
-        (base['Date'] >= week_start) &
-        (base['Date'] <= week_end)
-    ]
+def _date_bounds(data_df):
+    """(first, last) Date of a Date-sorted frame, read from its ends instead of min()/max() scans; (None, None) if empty."""
+    if not len(data_df):
+        return None, None
+    return data_df['Date'].iat[0], data_df['Date'].iat[-1]
+
+def _date_slice(data_df, start, end):
+    """Rows of a Date-sorted frame with start <= Date <= end. Binary search + positional slice instead of a boolean mask."""
+    dates = data_df['Date'].values
+    lo = dates.searchsorted(pd.Timestamp(start).to_datetime64(), side='left')
+    hi = dates.searchsorted(pd.Timestamp(end).to_datetime64(), side='right')
+    return data_df.iloc[lo:hi]
+
+def _filter_scope(data_df, advertiser, campaign, columns=None):
+    """Apply the advertiser/campaign filters ('All ...' means no filter) as one combined mask and a single take.
+    If columns is given, only those columns are copied out of the filtered rows."""
+    mask = None
     if advertiser and advertiser != "All Advertisers":
-        week_data = week_data[week_data['Advertiser'] == advertiser]
+        mask = data_df['Advertiser'] == advertiser
     if campaign and campaign != "All Campaigns":
-        week_data = week_data[week_data['Campaign'] == campaign]
-    
-    domain_metrics = week_data.groupby(group_col).agg({
-        'Conversions': 'sum',
-        'Clicks': 'sum',
-        'Impressions': 'sum'
-    }).reset_index()
-    
+        campaign_mask = data_df['Campaign'] == campaign
+        mask = campaign_mask if mask is None else mask & campaign_mask
+    if mask is None:
+        return data_df  # unfiltered: keep the zero-copy slice
+    return data_df.loc[mask, columns if columns is not None else data_df.columns]
+
+def calculate_metrics(domain_metrics, metric_type='Conversions', group_col='Clean Domain'):
+    """Rank one week's per-item totals (group_col, Conversions, Clicks, Impressions) by metric_type."""
     # Determine sort order based on metric_type with tie-breaking logic
     if metric_type == 'Conversions':
         sort_by = ['Conversions', 'Clicks', 'Impressions']
@@ -152,10 +267,11 @@ def calculate_metrics(advertiser, campaign, week_start, week_end, metric_type='C
     else:
         sort_by = ['Conversions', 'Clicks', 'Impressions']
     
-    domain_metrics = domain_metrics.sort_values(
-        by=sort_by,
-        ascending=False
-    ).reset_index(drop=True)
+    # One NumPy lexsort over the key arrays (last key = primary): metrics descending, then the item name
+    # ascending for full ties, since groups come out unsorted. Categorical codes follow the sorted categories.
+    item_codes = pd.factorize(domain_metrics[group_col], sort=True)[0]
+    order = np.lexsort([item_codes] + [-domain_metrics[col].to_numpy() for col in reversed(sort_by)])
+    domain_metrics = domain_metrics.take(order).reset_index(drop=True)
     
     domain_metrics['Rank'] = range(1, len(domain_metrics) + 1)
     return domain_metrics
@@ -163,10 +279,12 @@ def calculate_metrics(advertiser, campaign, week_start, week_end, metric_type='C
 @app.route('/api/filters', methods=['GET'])
 def get_filters():
     """Get available filter options"""
-    advertisers = sorted(df['Advertiser'].unique().tolist()) if len(df) else []
-    if len(df) and pd.notna(df['Date'].min()) and pd.notna(df['Date'].max()):
-        date_min = df['Date'].min().strftime('%Y-%m-%d')
-        date_max = df['Date'].max().strftime('%Y-%m-%d')
+    data_df, lookups = df, filter_lookups
+    advertisers = lookups['advertisers']
+    first_date, last_date = _date_bounds(data_df)
+    if first_date is not None:
+        date_min = first_date.strftime('%Y-%m-%d')
+        date_max = last_date.strftime('%Y-%m-%d')
     else:
         date_min = date_max = pd.Timestamp.now().strftime('%Y-%m-%d')
     return jsonify({
@@ -181,9 +299,9 @@ def get_campaigns():
     advertiser = request.args.get('advertiser')
     
     if advertiser and advertiser != "All Advertisers":
-        campaigns = sorted(df[df['Advertiser'] == advertiser]['Campaign'].unique().tolist())
+        campaigns = filter_lookups['advertiser_campaigns'].get(advertiser, [])
     else:
-        campaigns = sorted(df['Campaign'].unique().tolist())
+        campaigns = filter_lookups['all_campaigns']
     
     return jsonify({'campaigns': campaigns})
 
@@ -193,40 +311,165 @@ def get_campaign_advertiser():
     campaign = request.args.get('campaign')
     
     if campaign and campaign != "All Campaigns":
-        campaign_data = df[df['Campaign'] == campaign]
-        if not campaign_data.empty:
-            advertiser = campaign_data.iloc[0]['Advertiser']
+        advertiser = filter_lookups['campaign_advertiser'].get(campaign)
+        if advertiser is not None:
             return jsonify({'advertiser': advertiser})
     
     return jsonify({'advertiser': 'All Advertisers'})
 
-def get_raw_totals(advertiser, campaign, week_start, week_end, data_df=None):
-    """Get raw totals directly from data (not grouped). Use data_df if provided for speed."""
-    base = data_df if data_df is not None else df
-    week_data = base[
-        (base['Date'] >= week_start) &
-        (base['Date'] <= week_end)
-    ]
-    if advertiser and advertiser != "All Advertisers":
-        week_data = week_data[week_data['Advertiser'] == advertiser]
-    if campaign and campaign != "All Campaigns":
-        week_data = week_data[week_data['Campaign'] == campaign]
-    
+def get_raw_totals(week_data):
+    """Get raw totals directly from one week of already-filtered rows (not grouped)."""
     return {
         'impressions': int(week_data['Impressions'].sum()),
         'clicks': int(week_data['Clicks'].sum()),
         'conversions': int(week_data['Conversions'].sum())
     }
 
-@app.route('/api/dashboard-data', methods=['POST'])
+def _nullable_list(values, dtype):
+    """Float array as a list of Python numbers cast to dtype, with None where the value is NaN."""
+    missing = np.isnan(values)
+    cast = np.where(missing, 0, values).astype(dtype).tolist()
+    return [None if is_missing else value for value, is_missing in zip(cast, missing.tolist())]
+
+def _tier_rows(tiers, week1_by_item, week2_by_item, metric_type, trends):
+    """domainData rows for [(tier, items), ...], in that order. Both weeks are aligned to all the items in one
+    reindex (not ranked that week: value 0, rank None) and change % / rank change are computed with NumPy."""
+    items = [item for _, tier_items in tiers for item in tier_items]
+    item_tiers = [tier for tier, tier_items in tiers for _ in tier_items]
+    week1 = week1_by_item.reindex(items)
+    week2 = week2_by_item.reindex(items)
+    week1_value = week1[metric_type].fillna(0).to_numpy(dtype='float64')
+    week2_value = week2[metric_type].fillna(0).to_numpy(dtype='float64')
+    week1_rank = week1['Rank'].to_numpy(dtype='float64')  # NaN = not ranked that week
+    week2_rank = week2['Rank'].to_numpy(dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = np.where(week1_value > 0, (week2_value - week1_value) / week1_value * 100, np.nan)
+    rank_change = week1_rank - week2_rank
+    # Each column becomes a list of Python values in one cast + tolist(), not a NumPy scalar call per field
+    columns = zip(
+        items, item_tiers,
+        week1_value.astype('int64').tolist(), _nullable_list(week1_rank, 'int64'),
+        week2_value.astype('int64').tolist(), _nullable_list(week2_rank, 'int64'),
+        _nullable_list(change, 'float64'), _nullable_list(rank_change, 'int64'),
+    )
+    return [
+        {
+            'domain': item,
+            'tier': tier,
+            'week1Conv': week1_conv,
+            'rank1': rank1,
+            'week2Conv': week2_conv,
+            'rank2': rank2,
+            'change': change_pct,
+            'rankChange': rank_delta,
+            'trend': trends[item],  # 14-day trend from the shared pivot
+        }
+        for item, tier, week1_conv, rank1, week2_conv, rank2, change_pct, rank_delta in columns
+    ]
+
+def _pie_rows(metrics, top_n, metric_type, group_col):
+    """Pie slices for one week's ranking: the top N items plus 'Others' for the rest (if any are non-zero).
+    Names and truncated values come out of two column conversions instead of an iterrows() loop."""
+    top = metrics.head(top_n)
+    rows = [
+        {'name': name[:40], 'value': value}
+        for name, value in zip(top[group_col].tolist(), top[metric_type].to_numpy(dtype='int64').tolist())
+    ]
+    if len(metrics) > top_n:
+        others = metrics.iloc[top_n:][metric_type].sum()
+        if others > 0:
+            rows.append({'name': 'Others', 'value': int(others)})
+    return rows
+
+def _scope_aggregates(data_df, version, advertiser, campaign, week2_end, group_col):
+    """Aggregates for the two weeks ending week2_end under the advertiser/campaign filters:
+    (week1 raw totals, week2 raw totals, per-(Date, item) sums, per-(week 1|2, item) sums). Cached per data version."""
+    key = (version, advertiser, campaign, week2_end, group_col)
+    with _scope_cache_lock:
+        entry = _scope_cache.get(key)
+        if entry is not None:
+            _scope_cache.move_to_end(key)
+            return entry
+    week1_start, week1_end = get_week_range(week2_end, 1)
+    week2_start = get_week_range(week2_end, 0)[0]
+    # Only the two compared weeks feed the response; df is sorted by Date, so that range is a slice, not a mask
+    df_range = _date_slice(data_df, week1_start, week2_end)
+    # Apply advertiser/campaign filters once; everything below works on this scope (only the columns it reads)
+    df_scope = _filter_scope(df_range, advertiser, campaign,
+                             columns=['Date', group_col, 'Conversions', 'Clicks', 'Impressions'])
+    # Get raw totals from the per-week slices
+    week1_raw = get_raw_totals(_date_slice(df_scope, week1_start, week1_end))
+    week2_raw = get_raw_totals(_date_slice(df_scope, week2_start, week2_end))
+    # One (Date, group_col) aggregation over the scope for the trends and the contribution chart
+    # sort=False keeps first-appearance order, which is already Date order since df is sorted by Date
+    daily_metrics = df_scope.groupby(['Date', group_col], observed=True, sort=False)[
+        ['Conversions', 'Clicks', 'Impressions']
+    ].sum().reset_index()
+    # Both weeks' per-item totals from one groupby over the rows keyed by (week, item); the range is exactly
+    # week1 + week2. Summed from the rows, not from daily_metrics, so float Conversions add up in the same order
+    # as a per-week groupby and near-ties rank the same
+    week_number = np.where(df_scope['Date'].values >= week2_start.to_datetime64(), 2, 1)
+    weekly = df_scope.groupby([week_number, group_col], observed=True, sort=False)[
+        ['Conversions', 'Clicks', 'Impressions']
+    ].sum()
+    entry = (week1_raw, week2_raw, daily_metrics, weekly)
+    with _scope_cache_lock:
+        _scope_cache[key] = entry
+        while len(_scope_cache) > SCOPE_CACHE_MAX_ENTRIES:
+            _scope_cache.popitem(last=False)
+    return entry
+
+def _dashboard_cache_key(data):
+    """Cache key for a dashboard request body: data version + the parsed filters, so requests that only differ
+    in spelling (omitted defaults, '' vs the latest date, extra fields) share one entry."""
+    return (_df_version,) + _dashboard_params(data, df)
+
+
+def _render_dashboard(data, cache_key):
+    """Build and serialize the dashboard payload and store it in the response cache."""
+    # orjson: C encoder for the large nested payload (contribution rows x items); NumPy scalars pass through
+    body = orjson.dumps(build_dashboard_data(data), option=orjson.OPT_SERIALIZE_NUMPY)
+    _dashboard_cache_put(cache_key, body)
+    return body
+
+
+@app.route('/api/dashboard-data', methods=['GET', 'POST'])
 def get_dashboard_data():
-    """Get all dashboard data based on filters"""
-    data = request.json
-    
+    """Get all dashboard data based on filters (GET query args or POST JSON body); GET revalidates via ETag."""
+    if request.method != 'POST':  # GET / HEAD
+        data = request.args.to_dict()
+        if 'topN' in data:
+            data['topN'] = request.args.get('topN', 5, type=int)
+    else:
+        data = request.json
+    cache_key = _dashboard_cache_key(data)
+    body = _dashboard_cache_get(cache_key)
+    cache_status = 'HIT'
+    if body is None:
+        body = _render_dashboard(data, cache_key)
+        cache_status = 'MISS'
+    if request.method == 'POST':
+        response = app.response_class(body, mimetype='application/json')
+    else:
+        # Clients that kept an earlier copy can revalidate with If-None-Match and skip the body on 304
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+    response.headers['X-Cache'] = cache_status
+    return response
+
+
+def _dashboard_params(data, data_df):
+    """Parse a /api/dashboard-data request body into
+    (top_n, advertiser, campaign, selected_date, metric_type, analysis_type), with defaults applied."""
     top_n = data.get('topN', 5)
     advertiser = data.get('advertiser', 'All Advertisers')
     campaign = data.get('campaign', 'All Campaigns')
-    default_date = df['Date'].max() if len(df) and pd.notna(df['Date'].max()) else pd.Timestamp.now()
+    last_date = _date_bounds(data_df)[1]
+    default_date = last_date if last_date is not None else pd.Timestamp.now()
     raw_date = data.get('date') or None
     if raw_date is None or (isinstance(raw_date, str) and not raw_date.strip()):
         selected_date = default_date
@@ -242,225 +485,116 @@ def get_dashboard_data():
         selected_date = selected_date.normalize()
     metric_type = data.get('metric', 'Conversions')
     analysis_type = data.get('analysisType', 'Domain')
-    
-    # Determine grouping column based on analysis type
-    group_col = 'Clean Keyword' if analysis_type == 'Keyword' else 'Clean Domain'
+    return top_n, advertiser, campaign, selected_date, metric_type, analysis_type
+
+
+def build_dashboard_data(data):
+    """Compute the dashboard payload (KPIs, tiers, charts) for the filters in a /api/dashboard-data request body."""
+    # Bind the current frame once; a reload mid-request publishes a new one without touching this
+    data_df, version = df, _df_version
+    top_n, advertiser, campaign, selected_date, metric_type, analysis_type = _dashboard_params(data, data_df)
+    group_col = 'Clean Domain'
     
     # Calculate weeks
-    week0_start, week0_end = get_week_range(selected_date, 2)
     week1_start, week1_end = get_week_range(selected_date, 1)
     week2_start, week2_end = get_week_range(selected_date, 0)
-    week3_start, _ = get_week_range(selected_date, 3)
-    # Pre-filter to 4-week range so all later ops work on a small subset (big speedup)
-    df_range = df[(df['Date'] >= week3_start) & (df['Date'] <= week2_end)].copy()
-
-    # Get raw totals and grouped metrics using pre-filtered data
-    week1_raw = get_raw_totals(advertiser, campaign, week1_start, week1_end, data_df=df_range)
-    week2_raw = get_raw_totals(advertiser, campaign, week2_start, week2_end, data_df=df_range)
-    week0_metrics = calculate_metrics(advertiser, campaign, week0_start, week0_end, metric_type, group_col, data_df=df_range)
-    week1_metrics = calculate_metrics(advertiser, campaign, week1_start, week1_end, metric_type, group_col, data_df=df_range)
-    week2_metrics = calculate_metrics(advertiser, campaign, week2_start, week2_end, metric_type, group_col, data_df=df_range)
-    
+    if analysis_type == 'Keyword':
+        # The data has no keyword column, so only the KPIs are returned: raw totals, no per-item groupbys
+        df_scope = _filter_scope(_date_slice(data_df, week1_start, week2_end), advertiser, campaign,
+                                 columns=['Date', 'Conversions', 'Clicks', 'Impressions'])
+        week1_raw = get_raw_totals(_date_slice(df_scope, week1_start, week1_end))
+        week2_raw = get_raw_totals(_date_slice(df_scope, week2_start, week2_end))
+    else:
+        # Filtering and aggregation don't depend on topN/metric, so they are shared with requests that only change those
+        week1_raw, week2_raw, daily_metrics, weekly = _scope_aggregates(data_df, version, advertiser, campaign,
+                                                                        week2_end, group_col)
     # Calculate totals from raw data (guaranteed consistent)
-    week1_total = week1_raw[metric_type.lower()]
-    week2_total = week2_raw[metric_type.lower()]
+    kpis = {
+        'week1Total': int(week1_raw[metric_type.lower()]),
+        'week2Total': int(week2_raw[metric_type.lower()])
+    }
+    week_ranges = {
+        'week1': {
+            'start': week1_start.strftime('%Y-%m-%d'),
+            'end': week1_end.strftime('%Y-%m-%d')
+        },
+        'week2': {
+            'start': week2_start.strftime('%Y-%m-%d'),
+            'end': week2_end.strftime('%Y-%m-%d')
+        }
+    }
+    if analysis_type == 'Keyword':
+        return {'kpis': kpis, 'domainData': [], 'contributionData': [], 'pieDataWeek1': [], 'pieDataWeek2': [],
+                'weekRanges': week_ranges}
 
-    # Get top N from both weeks
-    week1_top = set(week1_metrics.head(top_n)[group_col].tolist())
-    week2_top = set(week2_metrics.head(top_n)[group_col].tolist())
-    
-    # Categorize
-    maintained_domains = week1_top.intersection(week2_top)
-    new_domains = week2_top - week1_top
-    dropped_domains = week1_top - week2_top
-    
-    # Build domain/keyword comparison data with tiers
-    domain_data = []
-    
-    # Tier 1: Maintained
-    for item in sorted(maintained_domains):
-        week1_row = week1_metrics[week1_metrics[group_col] == item].iloc[0]
-        week2_row = week2_metrics[week2_metrics[group_col] == item].iloc[0]
-        
-        week1_value = week1_row[metric_type]
-        week1_rank = week1_row['Rank']
-        week2_value = week2_row[metric_type]
-        week2_rank = week2_row['Rank']
-        
-        change_pct_val = ((week2_value - week1_value) / week1_value * 100) if week1_value > 0 else None
-        rank_change = week1_rank - week2_rank
-        
-        # Get 14-day trend (df_range already limited to week0_start..week2_end)
-        trend_data = df_range[df_range[group_col] == item]
-        if advertiser and advertiser != "All Advertisers":
-            trend_data = trend_data[trend_data['Advertiser'] == advertiser]
-        if campaign and campaign != "All Campaigns":
-            trend_data = trend_data[trend_data['Campaign'] == campaign]
-        daily = trend_data.groupby('Date')[metric_type].sum().reset_index()
-        all_dates = pd.date_range(week1_start, week2_end, freq='D')
-        daily = daily.set_index('Date').reindex(all_dates, fill_value=0).reset_index()
-        trend = daily[metric_type].tolist()
-        domain_data.append({
-            'domain': item,
-            'tier': 'maintained',
-            'week1Conv': int(week1_value),
-            'rank1': int(week1_rank),
-            'week2Conv': int(week2_value),
-            'rank2': int(week2_rank),
-            'change': float(change_pct_val) if change_pct_val is not None else None,
-            'rankChange': int(rank_change),
-            'trend': trend
-        })
+    weekly_week = weekly.index.get_level_values(0)
+    week1_metrics = calculate_metrics(weekly[weekly_week == 1].droplevel(0).reset_index(), metric_type, group_col)
+    week2_metrics = calculate_metrics(weekly[weekly_week == 2].droplevel(0).reset_index(), metric_type, group_col)
+
+    # Get top N from both weeks as categorical codes (both weeks share the frame's sorted categories)
+    categories = week1_metrics[group_col].cat.categories
+    week1_top = week1_metrics[group_col].head(top_n).cat.codes.to_numpy()
+    week2_top = week2_metrics[group_col].head(top_n).cat.codes.to_numpy()
     
-    # Tier 2: New Entry
-    for item in sorted(new_domains):
-        week2_row = week2_metrics[week2_metrics[group_col] == item].iloc[0]
-        week2_value = week2_row[metric_type]
-        week2_rank = week2_row['Rank']
-        
-        week1_row = week1_metrics[week1_metrics[group_col] == item]
-        if not week1_row.empty:
-            week1_value = week1_row.iloc[0][metric_type]
-            week1_rank = week1_row.iloc[0]['Rank']
-        else:
-            week1_value = 0
-            week1_rank = None
-        
-        change_pct_val = ((week2_value - week1_value) / week1_value * 100) if week1_value > 0 else None
-        rank_change = week1_rank - week2_rank if week1_rank else None
-        trend_data = df_range[df_range[group_col] == item]
-        if advertiser and advertiser != "All Advertisers":
-            trend_data = trend_data[trend_data['Advertiser'] == advertiser]
-        if campaign and campaign != "All Campaigns":
-            trend_data = trend_data[trend_data['Campaign'] == campaign]
-        daily = trend_data.groupby('Date')[metric_type].sum().reset_index()
-        all_dates = pd.date_range(week1_start, week2_end, freq='D')
-        daily = daily.set_index('Date').reindex(all_dates, fill_value=0).reset_index()
-        trend = daily[metric_type].tolist()
-        domain_data.append({
-            'domain': item,
-            'tier': 'new',
-            'week1Conv': int(week1_value),
-            'rank1': int(week1_rank) if week1_rank else None,
-            'week2Conv': int(week2_value),
-            'rank2': int(week2_rank),
-            'change': float(change_pct_val) if change_pct_val is not None else None,
-            'rankChange': int(rank_change) if rank_change else None,
-            'trend': trend
-        })
+    # Categorize on the integer codes; the NumPy set ops return sorted codes, i.e. items in name order
+    maintained_domains = categories[np.intersect1d(week1_top, week2_top)].tolist()
+    new_domains = categories[np.setdiff1d(week2_top, week1_top)].tolist()
+    dropped_domains = categories[np.setdiff1d(week1_top, week2_top)].tolist()
     
-    # Tier 3: Dropped
-    for item in sorted(dropped_domains):
-        week1_row = week1_metrics[week1_metrics[group_col] == item].iloc[0]
-        week1_value = week1_row[metric_type]
-        week1_rank = week1_row['Rank']
-        
-        week2_row = week2_metrics[week2_metrics[group_col] == item]
-        if not week2_row.empty:
-            week2_value = week2_row.iloc[0][metric_type]
-            week2_rank = week2_row.iloc[0]['Rank']
-        else:
-            week2_value = 0
-            week2_rank = None
-        
-        change_pct_val = ((week2_value - week1_value) / week1_value * 100) if week1_value > 0 else None
-        rank_change = week1_rank - week2_rank if week2_rank else None
-        trend_data = df_range[df_range[group_col] == item]
-        if advertiser and advertiser != "All Advertisers":
-            trend_data = trend_data[trend_data['Advertiser'] == advertiser]
-        if campaign and campaign != "All Campaigns":
-            trend_data = trend_data[trend_data['Campaign'] == campaign]
-        daily = trend_data.groupby('Date')[metric_type].sum().reset_index()
-        all_dates = pd.date_range(week1_start, week2_end, freq='D')
-        daily = daily.set_index('Date').reindex(all_dates, fill_value=0).reset_index()
-        trend = daily[metric_type].tolist()
-        domain_data.append({
-            'domain': item,
-            'tier': 'dropped',
-            'week1Conv': int(week1_value),
-            'rank1': int(week1_rank),
-            'week2Conv': int(week2_value),
-            'rank2': int(week2_rank) if week2_rank else None,
-            'change': float(change_pct_val) if change_pct_val is not None else None,
-            'rankChange': int(rank_change) if rank_change else None,
-            'trend': trend
-        })
-    
-    # Get ALL union items for contribution chart
-    all_union_items = sorted(maintained_domains | new_domains | dropped_domains)
-    # Build contribution data in one groupby (much faster than per-date per-item filters)
-    contrib_df = df_range.copy()
-    if advertiser and advertiser != "All Advertisers":
-        contrib_df = contrib_df[contrib_df['Advertiser'] == advertiser]
-    if campaign and campaign != "All Campaigns":
-        contrib_df = contrib_df[contrib_df['Campaign'] == campaign]
-    daily_sums = contrib_df.groupby(['Date', group_col])[metric_type].sum().unstack(fill_value=0)
+    # Get ALL union items; their 14-day trends and the contribution chart share one pivot of daily_metrics
+    all_union_items = categories[np.union1d(week1_top, week2_top)].tolist()
     all_dates = pd.date_range(week1_start, week2_end, freq='D')
+    # Pivot only the union items' rows (a few dozen columns) rather than every item in the scope
+    union_daily = daily_metrics[daily_metrics[group_col].isin(all_union_items)]
+    daily_sums = union_daily.set_index(['Date', group_col])[metric_type].unstack(fill_value=0)
     daily_sums = daily_sums.reindex(index=all_dates, fill_value=0).reindex(columns=all_union_items, fill_value=0)
-    contribution_data = []
-    for date in all_dates:
-        data_point = {'date': date.strftime('%b %d')}
-        for item in all_union_items:
-            data_point[item[:40]] = int(daily_sums.loc[date, item])
-        contribution_data.append(data_point)
-    
-    # Pie chart data - each week shows its own top N
-    pie_data_week1 = []
-    pie_data_week2 = []
     
-    for idx, row in week1_metrics.head(top_n).iterrows():
-        item_name = row[group_col]
-        pie_data_week1.append({
-            'name': item_name[:40],
-            'value': int(row[metric_type])
-        })
+    # Index weekly rankings by item so each tier aligns both weeks with one reindex
+    week1_by_item = week1_metrics.set_index(group_col)
+    week2_by_item = week2_metrics.set_index(group_col)
     
-    for idx, row in week2_metrics.head(top_n).iterrows():
-        item_name = row[group_col]
-        pie_data_week2.append({
-            'name': item_name[:40],
-            'value': int(row[metric_type])
-        })
+    # Every union item's trend list in one pass over the pivot (not one column Series per tier row)
+    trends = daily_sums.to_dict('list')
+
+    # Build domain/keyword comparison data with tiers: maintained, new entry, dropped
+    domain_data = _tier_rows(
+        [('maintained', maintained_domains), ('new', new_domains), ('dropped', dropped_domains)],
+        week1_by_item, week2_by_item, metric_type, trends
+    )
     
-    # Add "Others"
-    if len(week1_metrics) > top_n:
-        others_week1 = week1_metrics.iloc[top_n:][metric_type].sum()
-        if others_week1 > 0:
-            pie_data_week1.append({'name': 'Others', 'value': int(others_week1)})
+    # Materialize the pivot once as plain ints instead of a .loc lookup per (date, item) cell
+    contribution_keys = [item[:40] for item in all_union_items]
+    contribution_data = [
+        {'date': label, **dict(zip(contribution_keys, values))}
+        for label, values in zip(all_dates.strftime('%b %d'), daily_sums.to_numpy(dtype='int64').tolist())
+    ]
     
-    if len(week2_metrics) > top_n:
-        others_week2 = week2_metrics.iloc[top_n:][metric_type].sum()
-        if others_week2 > 0:
-            pie_data_week2.append({'name': 'Others', 'value': int(others_week2)})
+    # Pie chart data - each week shows its own top N
+    pie_data_week1 = _pie_rows(week1_metrics, top_n, metric_type, group_col)
+    pie_data_week2 = _pie_rows(week2_metrics, top_n, metric_type, group_col)
     
-    return jsonify({
-        'kpis': {
-            'week1Total': int(week1_total),
-            'week2Total': int(week2_total)
-        },
+    return {
+        'kpis': kpis,
         'domainData': domain_data,
         'contributionData': contribution_data,
         'pieDataWeek1': pie_data_week1,
         'pieDataWeek2': pie_data_week2,
-        'weekRanges': {
-            'week1': {
-                'start': week1_start.strftime('%Y-%m-%d'),
-                'end': week1_end.strftime('%Y-%m-%d')
-            },
-            'week2': {
-                'start': week2_start.strftime('%Y-%m-%d'),
-                'end': week2_end.strftime('%Y-%m-%d')
-            }
-        }
-    })
+        'weekRanges': week_ranges
+    }
 
 
 # ---- Daily analytics queue fetch at 5 AM UTC ----
 def _job_fetch_analytics_queue_and_reload():
-    """Scheduled job: submit queue for last N days (default 45), poll until succeeded, download CSV, reload. Runs at 5 AM UTC."""
+    """Scheduled job: submit queue for last N days (default 45), poll until succeeded, download CSV, reload. Runs at 5 AM UTC.
+    The download and CSV parse run in a spawned child (a fresh interpreter that imports only data_loader), so they
+    don't hold this process's GIL while it serves requests, and no threads, locks or pooled sockets are inherited."""
+    target_error = _fetch_target_error()
+    if target_error:
+        logger.warning("Analytics queue fetch skipped: %s", target_error)
+        return
     try:
-        from analytics_queue_fetcher import fetch_and_save
-        ok, result = fetch_and_save(output_path=DATA_CSV_PATH, last_n_days=None)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            ok, result = pool.submit(fetch_and_prepare).result()
         if ok:
             reload_data()
             logger.info("Analytics queue fetch succeeded: %s", result)
@@ -485,7 +619,8 @@ def _start_analytics_scheduler():
     logger.info("Analytics queue scheduler started: daily at %02d:00 UTC (last N days, default 45)", hour)
 
 
-_start_analytics_scheduler()
+if not _SPAWNED_CHILD:
+    _start_analytics_scheduler()
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
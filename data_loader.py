@@ -0,0 +1,191 @@
+"""
+Load the dashboard data (CSV or Parquet export) into the preprocessed frame backend_api serves, with its Feather cache.
+Importing this module loads nothing and starts nothing, so the scheduled fetch can run fetch_and_prepare in a freshly
+spawned process without the Flask app, its threads or the loaded frame.
+"""
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import csv
+import io
+import os
+import logging
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Data file: use env if set, else resolve relative to this script so it's always in project folder.
+# A .parquet path (same columns as the CSV export) is read directly instead of parsed; the fetchers, which
+# download CSV, refuse to write over it (see backend_api._fetch_target_error).
+_default_csv = Path(__file__).resolve().parent / "domain_data.csv"
+DATA_CSV_PATH = os.environ.get("DATA_CSV_PATH") or str(_default_csv)
+# Preprocessed copy of the loaded frame (same folder, .feather suffix); reused while it is newer than the CSV
+DATA_CACHE_PATH = str(Path(DATA_CSV_PATH).with_suffix(".feather"))
+
+# Bump when load_data()'s output changes shape (columns, dtypes, sort) so older cache files are rebuilt
+CACHE_FORMAT_VERSION = '1'
+
+def _source_signature():
+    """Feather schema metadata tying a cache file to the source it was built from: format version plus the
+    source's mtime (ns) and size. Compared for equality, so a source restored with an older mtime (cp -p,
+    a rollback) still misses the cache."""
+    st = os.stat(DATA_CSV_PATH)
+    return {b'domain_tool.cache_version': CACHE_FORMAT_VERSION.encode(),
+            b'domain_tool.source_mtime_ns': str(st.st_mtime_ns).encode(),
+            b'domain_tool.source_size': str(st.st_size).encode()}
+
+def _read_cached_frame():
+    """The frame load_data() built last time, if DATA_CACHE_PATH was built from the current source file; else None.
+    Arrow IPC keeps the categoricals (dictionaries in their order), int32 columns and the Date sort as written."""
+    if not os.path.isfile(DATA_CACHE_PATH):
+        return None
+    try:
+        table = feather.read_table(DATA_CACHE_PATH, memory_map=True)
+    except Exception as e:
+        logger.warning("Ignoring unreadable %s: %s", DATA_CACHE_PATH, e)
+        return None
+    metadata = table.schema.metadata or {}
+    if any(metadata.get(key) != value for key, value in _source_signature().items()):
+        return None
+    cached = table.to_pandas()
+    if not {'Date', 'Clean Domain', 'Impressions', 'Conversions'}.issubset(cached.columns):
+        return None
+    return cached
+
+def _write_cached_frame(data_df, signature):
+    """Save the preprocessed frame for the next load, tagged with the source signature taken before it was read;
+    a failed write only costs the next load a CSV parse.
+    Each writer gets its own temp file (the scheduled job's child process and an in-process reload can both be
+    writing), so the last os.replace wins with a complete file."""
+    tmp_path = f"{DATA_CACHE_PATH}.{os.getpid()}.{uuid.uuid4().hex}.part"
+    try:
+        table = pa.Table.from_pandas(data_df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **signature})
+        feather.write_feather(table, tmp_path)
+        os.replace(tmp_path, DATA_CACHE_PATH)  # readers see the old file or the complete new one
+    except Exception as e:
+        logger.warning("Could not write %s: %s", DATA_CACHE_PATH, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+# Source columns load_data() reads (either date / domain spelling); anything else in the export is skipped
+SOURCE_COLUMNS = {'Day', 'Date', 'Advertiser', 'Campaign', 'Domain', 'Domain (Old)', 'Ad Impressions', 'Clicks',
+                  'Weighted Conversion'}
+
+def _csv_header():
+    """Column names from the first line of the CSV, as written (may carry stray whitespace).
+    Read through pyarrow's input stream so a .csv.gz / .csv.bz2 export is decompressed the same way read_csv does."""
+    with io.TextIOWrapper(pa.input_stream(DATA_CSV_PATH, compression='detect'), encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+def _read_source():
+    """Read the raw rows with pyarrow: a .parquet export as stored, anything else parsed as CSV.
+    Only SOURCE_COLUMNS are read; other columns are never parsed or converted."""
+    # Repeated strings are dictionary-encoded while reading, so they reach pandas as categoricals (no str per row)
+    categorical_columns = ['Advertiser', 'Campaign', 'Domain', 'Domain (Old)']
+    if DATA_CSV_PATH.lower().endswith('.parquet'):
+        columns = [name for name in pq.read_schema(DATA_CSV_PATH).names if name.strip() in SOURCE_COLUMNS]
+        table = pq.read_table(DATA_CSV_PATH, columns=columns, read_dictionary=categorical_columns)
+    else:
+        categorical = pa.dictionary(pa.int32(), pa.string())
+        column_types = {'Clicks': pa.int64(), 'Ad Impressions': pa.int64(), 'Weighted Conversion': pa.float64()}
+        column_types.update((col, categorical) for col in categorical_columns)
+        columns = [name for name in _csv_header() if name.strip() in SOURCE_COLUMNS]
+        # strings_can_be_null: empty / NA-token cells become nulls (NaN in pandas, dropped by the groupbys) as in
+        # pd.read_csv, instead of a '' item
+        table = pv.read_csv(DATA_CSV_PATH, convert_options=pv.ConvertOptions(
+            column_types=column_types, include_columns=columns, strings_can_be_null=True))
+    # Date-only columns (e.g. Day = 2026-02-14) are inferred as date32, and Parquet timestamps may be in us/ms;
+    # cast in Arrow so pandas gets datetime64[ns]
+    for i, field in enumerate(table.schema):
+        if (pa.types.is_date(field.type) or pa.types.is_timestamp(field.type)) and field.type != pa.timestamp('ns'):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp('ns')))
+    return table.to_pandas()
+
+def _narrow_int(values):
+    """Integer column as int32 when every value fits (half the bytes for each filter/groupby pass), else int64.
+    Sums stay exact: pandas accumulates int32 in int64."""
+    values = values.astype('int64')
+    limits = np.iinfo(np.int32)
+    if len(values) and (values.min() < limits.min or values.max() > limits.max):
+        return values
+    return values.astype('int32')
+
+def _strip_www(domains):
+    """Categorical domains with a leading 'www.' (any case) removed. Prefix check + slice once per distinct
+    domain (Arrow string kernels) instead of a regex per row; the result's categories stay sorted like astype('category')."""
+    names = pa.array(domains.cat.categories, type=pa.string())
+    cleaned = pc.if_else(pc.starts_with(names, 'www.', ignore_case=True), pc.utf8_slice_codeunits(names, 4), names)
+    cleaned = cleaned.to_numpy(zero_copy_only=False)
+    clean_codes, clean_names = pd.factorize(cleaned, sort=True)
+    codes = domains.cat.codes.to_numpy()
+    return pd.Categorical.from_codes(np.where(codes >= 0, clean_codes[codes], -1), categories=clean_names)
+
+# Load data with optimized dtypes for faster load and lower memory
+# Expects: Day (format 2026-02-14), Advertiser, Campaign, Domain, Ad Impressions, Clicks, Weighted Conversion
+def load_data():
+    """Load and preprocess the data from DATA_CSV_PATH. Returns empty DataFrame if file missing (e.g. localhost before first Gmail fetch)."""
+    if not os.path.isfile(DATA_CSV_PATH):
+        logger.warning("Data file not found: %s. Use Gmail fetcher or add file, then reload.", DATA_CSV_PATH)
+        return pd.DataFrame(columns=[
+            "Day", "Advertiser", "Campaign", "Domain", "Clicks", "Date", "Impressions", "Conversions", "Clean Domain"
+        ]).astype({"Date": "datetime64[ns]", "Clicks": "int32", "Impressions": "int32",
+                   "Advertiser": "category", "Campaign": "category", "Domain": "category", "Clean Domain": "category"})
+    cached = _read_cached_frame()
+    if cached is not None:
+        return cached
+    signature = _source_signature()  # before the read: a file replaced mid-parse then misses the cache next time
+    df = _read_source()
+    df.columns = df.columns.str.strip()
+    # Normalize column names: some CSVs use "Domain (Old)" instead of "Domain"
+    if 'Domain' not in df.columns and 'Domain (Old)' in df.columns:
+        df['Domain'] = df['Domain (Old)'].astype(str)
+    elif 'Domain' not in df.columns:
+        raise ValueError("CSV must have a 'Domain' or 'Domain (Old)' column")
+    # Day column: accept 2026-02-14, 2026/02/14, or ISO with time (strip whitespace)
+    date_col_name = 'Day' if 'Day' in df.columns else 'Date'
+    if pd.api.types.is_datetime64_any_dtype(df[date_col_name]):
+        # Already parsed by the pyarrow reader (ISO dates/timestamps)
+        df['Date'] = df[date_col_name]
+    else:
+        day_col = df[date_col_name]
+        if not pd.api.types.is_string_dtype(day_col):
+            day_col = day_col.astype(str)
+        day_col = day_col.str.strip()
+        # cache=True (the default) parses each distinct day once; rows repeat the same few dozen dates
+        df['Date'] = pd.to_datetime(day_col, format='%Y-%m-%d', errors='coerce', cache=True)
+        # If strict format parsed nothing, try inferring (e.g. 2026/02/14 or ISO datetime)
+        if df['Date'].isna().all():
+            df['Date'] = pd.to_datetime(day_col, errors='coerce')
+    df = df.dropna(subset=['Date'])
+    df['Impressions'] = _narrow_int(df['Ad Impressions'])
+    df['Clicks'] = _narrow_int(df['Clicks'])
+    df['Conversions'] = df['Weighted Conversion'].fillna(0).astype('float64')  # sum as float, display as int
+    # Only the derived copies are read from here on; don't carry the int64/float source columns as well
+    df = df.drop(columns=['Ad Impressions', 'Weighted Conversion'])
+    # Repeated strings as categoricals: == filters and groupbys then work on integer codes
+    # (already categorical from the reader; this covers the "Domain (Old)" rename)
+    for col in ('Advertiser', 'Campaign', 'Domain'):
+        df[col] = df[col].astype('category')
+    df['Clean Domain'] = _strip_www(df['Domain'])
+    # Keep rows sorted by Date so date windows are binary-search slices (see _date_slice)
+    df = df.sort_values('Date', kind='stable').reset_index(drop=True)
+    _write_cached_frame(df, signature)
+    return df
+
+
+def fetch_and_prepare():
+    """Download the CSV and build its Feather cache (load_data writes it), so the following reload only reads
+    the finished frame. Run by backend_api's scheduled job in a spawned child process."""
+    from analytics_queue_fetcher import fetch_and_save
+    ok, result = fetch_and_save(output_path=DATA_CSV_PATH, last_n_days=None)
+    if ok:
+        load_data()
+    return ok, result
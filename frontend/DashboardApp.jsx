@@ -278,13 +278,11 @@ export default function DashboardApp() {
     const payload = filtersOverride ?? filters;
     setLoading(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/dashboard-data`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify(payload)
-      });
+      // GET with query args: the response carries an ETag, so the browser revalidates a repeat request (304)
+      const params = new URLSearchParams(
+        Object.entries(payload).filter(([, value]) => value !== null && value !== undefined)
+      );
+      const response = await fetch(`${API_BASE_URL}/dashboard-data?${params}`);
       const data = await response.json();
       setDashboardData(data);
     } catch (error) {
@@ -294,11 +292,31 @@ export default function DashboardApp() {
     }
   };
 
+  // Under gunicorn /reload answers 202 and the workers restart with the new data afterwards:
+  // poll data-status until a worker reports a reload newer than reloadCount, then report its outcome
+  const waitForReload = async (reloadCount) => {
+    for (let attempt = 0; attempt < 60; attempt++) {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+      try {
+        const status = await (await fetch(`${API_BASE_URL}/data-status`)).json();
+        if (status.reload_count > reloadCount) {
+          return status.reload_error
+            ? { status: 'error', message: 'Reload failed: ' + status.reload_error }
+            : { status: 'ok', rows: status.rows_loaded };
+        }
+      } catch (e) {
+        // workers restarting; try again
+      }
+    }
+    return { status: 'error', message: 'Reload still in progress' };
+  };
+
   const handleReloadData = async () => {
     setReloadStatus('Reloading...');
     try {
       const r = await fetch(`${API_BASE_URL}/reload`, { method: 'POST' });
-      const data = await r.json();
+      let data = await r.json();
+      if (r.status === 202) data = await waitForReload(data.reload_count);
       if (data.status === 'ok') {
         setReloadStatus(`Loaded ${data.rows ?? '?'} rows`);
         await fetchFilterOptions();
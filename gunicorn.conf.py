@@ -0,0 +1,33 @@
+"""
+Gunicorn settings for the dashboard API (Linux deploys): gunicorn -c gunicorn.conf.py backend_api:app
+
+preload_app imports backend_api once in the master, so the dataframe is loaded once and forked workers share
+its pages copy-on-write instead of each parsing the data. The daily analytics scheduler also runs only in the master.
+Because workers hold a forked copy, every reload goes through the master: reload_data() (from /api/reload,
+/api/fetch or the scheduled job) sends SIGHUP to the master, which reloads the data and re-forks the workers.
+/api/reload therefore answers 202 before the new data is live; /api/data-status reports reload_count and
+reload_error as set by the master, so a client polls it until a worker forked after the reload answers.
+`kill -HUP <master pid>` does the same by hand.
+"""
+import os
+import signal
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+# threads > 1 selects the gthread worker: a slow dashboard computation no longer blocks the worker's other requests,
+# and pandas/NumPy kernels release the GIL. The response/scope caches and reloads are lock-protected.
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = 120
+preload_app = True
+
+
+def on_starting(server):
+    """Forward reload_data() calls (master and the workers forked from it) to the master via SIGHUP."""
+    import backend_api
+    backend_api.reload_forwarder = lambda: os.kill(server.pid, signal.SIGHUP)
+
+
+def on_reload(server):
+    """SIGHUP: reload the data in the master before gunicorn forks the new workers."""
+    import backend_api
+    backend_api.reload_local_data()